@@ -10,14 +10,13 @@ Usage:
     cd backend
     python add_sample_data.py
 """
-import random
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Check for required dependencies
 try:
-    from sqlalchemy import create_engine
+    from sqlalchemy import create_engine, event
     from sqlalchemy.orm import sessionmaker
 except ImportError:
     print("❌ Error: SQLAlchemy not found.")
@@ -28,7 +27,15 @@ except ImportError:
     sys.exit(1)
 
 try:
-    from scipy.stats import norm
+    import numpy as np
+except ImportError:
+    print("❌ Error: numpy not found.")
+    print("Please install dependencies first:")
+    print("  python -m pip install -r requirements.txt")
+    sys.exit(1)
+
+try:
+    from scipy.special import ndtr  # noqa: F401
 except ImportError:
     print("❌ Error: scipy not found.")
     print("Please install dependencies first:")
@@ -41,8 +48,9 @@ sys.path.insert(0, str(backend_dir))
 
 # Import models and calculation logic directly
 try:
+    from app.database import set_sqlite_pragmas, upgrade_calculations_table
     from app.models import Calculation, Base
-    from app.black_scholes import calculate_call_put
+    from app.black_scholes import calculate_call_put_batch
 except ImportError as e:
     print(f"❌ Error importing app modules: {e}")
     print("Make sure you're running from the backend directory.")
@@ -54,53 +62,60 @@ engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+event.listen(engine, "connect", set_sqlite_pragmas)
 
 # Ensure tables exist
 Base.metadata.create_all(bind=engine)
+upgrade_calculations_table(engine)
 
 def generate_sample_data():
     """Generate 100 random Black-Scholes calculations."""
     db = SessionLocal()
     
     try:
-        # Generate 100 random calculations
-        for i in range(100):
-            # Random parameters within reasonable ranges
-            s0 = round(random.uniform(50, 200), 2)  # Stock price: $50-$200
-            x = round(random.uniform(50, 200), 2)   # Strike price: $50-$200
-            t = round(random.uniform(0.1, 5.0), 2)  # Time: 0.1-5 years
-            r = round(random.uniform(0.01, 0.10), 4)  # Interest rate: 1%-10%
-            d = round(random.uniform(0.0, 0.05), 4)   # Dividend yield: 0%-5%
-            v = round(random.uniform(0.10, 0.50), 4)  # Volatility: 10%-50%
-            
-            try:
-                # Calculate prices
-                call_price, put_price, d1, d2 = calculate_call_put(s0, x, t, r, d, v)
-                
-                # Create calculation with random timestamp (within last 30 days)
-                days_ago = random.randint(0, 30)
-                created_at = datetime.utcnow() - timedelta(days=days_ago, hours=random.randint(0, 23))
-                
-                calc = Calculation(
-                    s0=s0,
-                    x=x,
-                    t=t,
-                    r=r,
-                    d=d,
-                    v=v,
-                    call_price=call_price,
-                    put_price=put_price,
-                    created_at=created_at
-                )
-                
-                db.add(calc)
-                if (i + 1) % 10 == 0:
-                    print(f"Added {i+1}/100 calculations...")
-                
-            except ValueError as e:
-                print(f"Skipping invalid calculation {i+1}: {e}")
-                continue
-        
+        rng = np.random.default_rng()
+        n = 100
+
+        # Random parameters within reasonable ranges; all valid by construction
+        s0 = np.round(rng.uniform(50, 200, n), 2)  # Stock price: $50-$200
+        x = np.round(rng.uniform(50, 200, n), 2)   # Strike price: $50-$200
+        t = np.round(rng.uniform(0.1, 5.0, n), 2)  # Time: 0.1-5 years
+        r = np.round(rng.uniform(0.01, 0.10, n), 4)  # Interest rate: 1%-10%
+        d = np.round(rng.uniform(0.0, 0.05, n), 4)   # Dividend yield: 0%-5%
+        v = np.round(rng.uniform(0.10, 0.50, n), 4)  # Volatility: 10%-50%
+
+        # Calculate all prices in one vectorised pass
+        call_price, put_price, d1, d2 = calculate_call_put_batch(s0, x, t, r, d, v)
+
+        # Random timestamps within the last 30 days
+        now = datetime.utcnow()
+        days_ago = rng.integers(0, 31, n)
+        hours_ago = rng.integers(0, 24, n)
+
+        columns = {
+            "s0": s0,
+            "x": x,
+            "t": t,
+            "r": r,
+            "d": d,
+            "v": v,
+            "call_price": call_price,
+            "put_price": put_price,
+            "d1": d1,
+            "d2": d2,
+        }
+        rows = [
+            {
+                **{name: float(values[i]) for name, values in columns.items()},
+                "created_at": now - timedelta(
+                    days=int(days_ago[i]), hours=int(hours_ago[i])
+                ),
+            }
+            for i in range(n)
+        ]
+
+        # Single multi-row INSERT instead of one per calculation
+        db.bulk_insert_mappings(Calculation, rows)
         db.commit()
         print("\n✅ Successfully added 100 sample calculations to the database!")
         print(f"Database file: {Path(__file__).parent / 'calculations.db'}")
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 from typing import Tuple
 
-from scipy.stats import norm
+import numpy as np
+from scipy.special import ndtr
+
+from .black_scholes_numba import NUMBA_ENABLED, bs_kernel
+
+try:
+    from ._bs_ext import bs_price as _bs_price_ext
+except ImportError:  # extension not built; see setup.py
+    _bs_price_ext = None
 
 
 def _validate_inputs(
@@ -24,10 +33,10 @@ def calculate_d1_d2(
     Calculate the d1 and d2 parameters used in the Black-Scholes formula.
     """
     _validate_inputs(s0, x, t, v)
-    numerator = math.log(s0 / x) + (r - d + 0.5 * v * v) * t
-    denominator = v * math.sqrt(t)
-    d1 = numerator / denominator
-    d2 = d1 - v * math.sqrt(t)
+    half_vv = 0.5 * v * v
+    vsqrt_t = v * math.sqrt(t)
+    d1 = (math.log(s0 / x) + (r - d + half_vv) * t) / vsqrt_t
+    d2 = d1 - vsqrt_t
     return d1, d2
 
 
@@ -37,20 +46,107 @@ def calculate_call_put(
     """
     Calculate call and put prices using the Black-Scholes formula.
 
+    Results are memoised, so repeated requests for the same parameters are
+    served without recomputation.
+
     Returns:
         call_price, put_price, d1, d2
     """
+    return _calculate_call_put_cached(
+        float(s0), float(x), float(t), float(r), float(d), float(v)
+    )
+
+
+@lru_cache(maxsize=4096)
+def _calculate_call_put_cached(
+    s0: float, x: float, t: float, r: float, d: float, v: float
+) -> Tuple[float, float, float, float]:
+    if NUMBA_ENABLED:
+        _validate_inputs(s0, x, t, v)
+        return bs_kernel(s0, x, t, r, d, v)
+    if _bs_price_ext is not None:
+        _validate_inputs(s0, x, t, v)
+        return _bs_price_ext(s0, x, t, r, d, v)
+
     d1, d2 = calculate_d1_d2(s0, x, t, r, d, v)
-    nd1 = norm.cdf(d1)
-    nd2 = norm.cdf(d2)
-    n_minus_d1 = norm.cdf(-d1)
-    n_minus_d2 = norm.cdf(-d2)
+    nd1 = ndtr(d1)
+    nd2 = ndtr(d2)
 
     discount_dividend = math.exp(-d * t)
     discount_rate = math.exp(-r * t)
 
     call_price = s0 * discount_dividend * nd1 - x * discount_rate * nd2
-    put_price = x * discount_rate * n_minus_d2 - s0 * discount_dividend * n_minus_d1
+    # Put-call parity: P = C - S0*e^(-d*t) + X*e^(-r*t). The subtraction cancels
+    # for deep out-of-the-money puts and can leave ~-1e-14, so clamp at zero.
+    put_price = max(call_price - s0 * discount_dividend + x * discount_rate, 0.0)
 
     return call_price, put_price, d1, d2
 
+
+def calculate_call_put_batch(
+    s0: np.ndarray,
+    x: np.ndarray,
+    t: np.ndarray,
+    r: np.ndarray,
+    d: np.ndarray,
+    v: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorised Black-Scholes over arrays of parameters.
+
+    Inputs are not validated; callers must ensure s0, x, t and v are positive.
+
+    Returns:
+        call_prices, put_prices, d1, d2
+    """
+    # Each step writes into preallocated buffers instead of allocating a new
+    # temporary per operator; a, b and c are reused scratch space.
+    call_prices = np.empty_like(s0, dtype=float)
+    put_prices = np.empty_like(call_prices)
+    d1 = np.empty_like(call_prices)
+    d2 = np.empty_like(call_prices)
+    a = np.empty_like(call_prices)
+    b = np.empty_like(call_prices)
+    c = np.empty_like(call_prices)
+
+    # a = v * sqrt(t)
+    np.sqrt(t, out=a)
+    a *= v
+
+    # d1 = (ln(s0 / x) + (r - d + 0.5 * v^2) * t) / (v * sqrt(t)); d2 = d1 - v * sqrt(t)
+    np.multiply(v, v, out=d1)
+    d1 *= 0.5
+    d1 += r
+    d1 -= d
+    d1 *= t
+    np.divide(s0, x, out=b)
+    np.log(b, out=b)
+    d1 += b
+    d1 /= a
+    np.subtract(d1, a, out=d2)
+
+    # b = N(d1), c = N(d2)
+    ndtr(d1, out=b)
+    ndtr(d2, out=c)
+
+    # a = s0 * e^(-d*t); call = a * N(d1)
+    np.multiply(d, t, out=a)
+    np.negative(a, out=a)
+    np.exp(a, out=a)
+    a *= s0
+    np.multiply(a, b, out=call_prices)
+
+    # b = x * e^(-r*t); call -= b * N(d2)
+    np.multiply(r, t, out=b)
+    np.negative(b, out=b)
+    np.exp(b, out=b)
+    b *= x
+    c *= b
+    call_prices -= c
+
+    # Put-call parity, clamped at zero (see the scalar kernel)
+    np.subtract(call_prices, a, out=put_prices)
+    put_prices += b
+    np.maximum(put_prices, 0.0, out=put_prices)
+
+    return call_prices, put_prices, d1, d2
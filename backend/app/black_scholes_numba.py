@@ -0,0 +1,51 @@
+"""
+Optional numba-compiled scalar Black-Scholes kernel.
+
+The kernel is only enabled when the ``USE_NUMBA=1`` environment variable is set
+and numba is importable; otherwise ``NUMBA_ENABLED`` is False and callers should
+use the scipy-based implementation in ``black_scholes``.
+"""
+from __future__ import annotations
+
+import math
+import os
+from typing import Tuple
+
+_INV_SQRT2 = 0.7071067811865476
+
+
+def _bs_kernel(
+    s0: float, x: float, t: float, r: float, d: float, v: float
+) -> Tuple[float, float, float, float]:
+    half_vv = 0.5 * v * v
+    vsqrt_t = v * math.sqrt(t)
+    d1 = (math.log(s0 / x) + (r - d + half_vv) * t) / vsqrt_t
+    d2 = d1 - vsqrt_t
+
+    # Phi(y) = 0.5 * erfc(-y / sqrt(2))
+    nd1 = 0.5 * math.erfc(-d1 * _INV_SQRT2)
+    nd2 = 0.5 * math.erfc(-d2 * _INV_SQRT2)
+
+    discount_dividend = math.exp(-d * t)
+    discount_rate = math.exp(-r * t)
+
+    call_price = s0 * discount_dividend * nd1 - x * discount_rate * nd2
+    # Put-call parity: P = C - S0*e^(-d*t) + X*e^(-r*t), clamped at zero because
+    # the subtraction cancels for deep out-of-the-money puts
+    put_price = max(call_price - s0 * discount_dividend + x * discount_rate, 0.0)
+    return call_price, put_price, d1, d2
+
+
+NUMBA_ENABLED = False
+bs_kernel = _bs_kernel
+
+if os.environ.get("USE_NUMBA") == "1":
+    try:
+        from numba import njit
+    except ImportError:
+        pass
+    else:
+        bs_kernel = njit(cache=True, fastmath=True)(_bs_kernel)
+        # Compile (or load from cache) now so the first request doesn't pay for it
+        bs_kernel(100.0, 100.0, 1.0, 0.05, 0.0, 0.2)
+        NUMBA_ENABLED = True
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./calculations.db"
@@ -7,11 +7,92 @@ engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Put each new SQLite connection in WAL mode.
+
+    WAL lets readers proceed while a write is in progress, and with
+    synchronous=NORMAL commits no longer fsync the database file.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+event.listen(engine, "connect", set_sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+def _backfill_d1_d2(conn) -> None:
+    """One-off migration step: compute d1/d2 for rows stored without them."""
+    # Imported here so the pricing module (and any numba compilation) is only
+    # loaded when there is actually something to migrate
+    from .black_scholes import calculate_d1_d2
+
+    backfill = []
+    for calc_id, s0, x, t, r, d, v in conn.execute(
+        text("SELECT id, s0, x, t, r, d, v FROM calculations")
+    ):
+        try:
+            d1, d2 = calculate_d1_d2(s0, x, t, r, d, v)
+        except ValueError:
+            continue
+        backfill.append({"id": calc_id, "d1": d1, "d2": d2})
+    if backfill:
+        conn.execute(
+            text("UPDATE calculations SET d1 = :d1, d2 = :d2 WHERE id = :id"),
+            backfill,
+        )
+
+
+def upgrade_calculations_table(bind) -> None:
+    """
+    Bring an existing calculations table up to date with the model.
+
+    ``create_all`` only creates missing tables, so existing SQLite files need
+    newer nullable columns and indexes added by hand. Tables created before
+    ``created_at`` had a server-side default are rebuilt, since SQLite cannot
+    alter a column default in place. When the d1/d2 columns are added, the
+    existing rows are backfilled in the same step so reads never need to
+    recompute them.
+    """
+    inspector = inspect(bind)
+    if not inspector.has_table("calculations"):
+        return
+    table = Base.metadata.tables["calculations"]
+    columns = {column["name"]: column for column in inspector.get_columns("calculations")}
+    with bind.begin() as conn:
+        if "d1" not in columns or "d2" not in columns:
+            for name in ("d1", "d2"):
+                if name not in columns:
+                    conn.execute(text(f"ALTER TABLE calculations ADD COLUMN {name} FLOAT"))
+            _backfill_d1_d2(conn)
+
+        if columns["created_at"]["default"] is None:
+            for index in inspector.get_indexes("calculations"):
+                conn.execute(text(f"DROP INDEX {index['name']}"))
+            conn.execute(text("ALTER TABLE calculations RENAME TO calculations_old"))
+            table.create(conn)
+            names = ", ".join(column.name for column in table.columns)
+            conn.execute(
+                text(f"INSERT INTO calculations ({names}) SELECT {names} FROM calculations_old")
+            )
+            conn.execute(text("DROP TABLE calculations_old"))
+            # The count triggers went with the old table
+            from .models import install_calculation_counter
+
+            install_calculation_counter(conn)
+
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 def get_db():
     db = SessionLocal()
     try:
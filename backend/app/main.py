@@ -1,14 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from .database import Base, engine
+from .database import Base, engine, upgrade_calculations_table
 from .routers import calculations
 
 Base.metadata.create_all(bind=engine)
+upgrade_calculations_table(engine)
 
 app = FastAPI(
     title="Black-Scholes Calculator API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -1,6 +1,4 @@
-from datetime import datetime
-
-from sqlalchemy import Column, DateTime, Float, Integer
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, event, text
 
 from .database import Base
 
@@ -17,7 +15,56 @@ class Calculation(Base):
     v = Column(Float, nullable=False)  # Volatility
     call_price = Column(Float, nullable=False)
     put_price = Column(Float, nullable=False)
+    d1 = Column(Float, nullable=True)  # NULL for rows stored before d1/d2 were persisted
+    d2 = Column(Float, nullable=True)
+    # Filled in by SQLite, in the same text format SQLAlchemy uses for DateTime
+    # so stored values compare correctly against bound parameters
     created_at = Column(
-        DateTime, nullable=False, default=datetime.utcnow, index=True
+        DateTime,
+        nullable=False,
+        server_default=text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"),
+    )
+
+    # Serves the newest-first history listing and its keyset pagination
+    __table_args__ = (
+        Index("ix_calc_created_id", created_at.desc(), id.desc()),
     )
 
+
+
+class Counter(Base):
+    """Row counts kept current by triggers, so counting never scans a table."""
+
+    __tablename__ = "counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False)
+
+
+def install_calculation_counter(connection) -> None:
+    """
+    Reseed the calculations counter and create the triggers that maintain it.
+
+    The triggers fire for every write, including ones made outside the API
+    (e.g. add_sample_data.py), so the counter never drifts.
+    """
+    Counter.__table__.create(connection, checkfirst=True)
+    connection.execute(text(
+        "INSERT OR REPLACE INTO counters (name, value) "
+        "SELECT 'calculations', COUNT(id) FROM calculations"
+    ))
+    connection.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS calculations_count_insert "
+        "AFTER INSERT ON calculations BEGIN "
+        "UPDATE counters SET value = value + 1 WHERE name = 'calculations'; END"
+    ))
+    connection.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS calculations_count_delete "
+        "AFTER DELETE ON calculations BEGIN "
+        "UPDATE counters SET value = value - 1 WHERE name = 'calculations'; END"
+    ))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_calculation_counter(target, connection, **kw) -> None:
+    install_calculation_counter(connection)
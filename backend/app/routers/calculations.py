@@ -1,14 +1,22 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, insert, select, tuple_
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
-from ..black_scholes import calculate_call_put
+from ..black_scholes import (
+    calculate_call_put,
+    calculate_call_put_batch,
+)
 from ..database import get_db
 
 router = APIRouter(prefix="/api", tags=["calculations"])
 
+DELETE_CHUNK_SIZE = 500
+
 
 @router.post(
     "/calculate",
@@ -33,56 +41,92 @@ def create_calculation(
             detail=str(exc),
         ) from exc
 
-    calc = models.Calculation(
-        s0=payload.s0,
-        x=payload.x,
-        t=payload.t,
-        r=payload.r,
-        d=payload.d,
-        v=payload.v,
-        call_price=call_price,
-        put_price=put_price,
-    )
-    db.add(calc)
+    row = {
+        **payload.model_dump(),
+        "call_price": float(call_price),
+        "put_price": float(put_price),
+        "d1": d1,
+        "d2": d2,
+    }
+    # RETURNING hands back the generated id/timestamp without a refresh SELECT
+    calc_id, created_at = db.execute(
+        insert(models.Calculation).returning(
+            models.Calculation.id, models.Calculation.created_at
+        ),
+        row,
+    ).one()
     db.commit()
-    db.refresh(calc)
-
-    return schemas.CalculationRead(
-        id=calc.id,
-        s0=calc.s0,
-        x=calc.x,
-        t=calc.t,
-        r=calc.r,
-        d=calc.d,
-        v=calc.v,
-        call_price=calc.call_price,
-        put_price=calc.put_price,
-        d1=d1,
-        d2=d2,
-        created_at=calc.created_at,
-    )
 
+    return schemas.CalculationRead(id=calc_id, created_at=created_at, **row)
 
-@router.get("/history", response_model=List[schemas.CalculationSummary])
+
+@router.get(
+    "/history",
+    response_model=List[schemas.CalculationRead],
+    response_model_exclude={"__all__": {"d1", "d2"}},
+)
 def list_calculations(
     skip: int = 0,
     limit: int = 10,
+    before_id: Optional[int] = None,
+    before_created_at: Optional[datetime] = None,
     db: Session = Depends(get_db)
-) -> List[schemas.CalculationSummary]:
-    calculations = (
-        db.query(models.Calculation)
-        .order_by(models.Calculation.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+) -> List[schemas.CalculationRead]:
+    """
+    List calculations newest first.
+
+    For keyset paging, pass the ``id`` and ``created_at`` of the last row
+    already shown as ``before_id`` and ``before_created_at``; this fetches the
+    next page without an OFFSET scan and keeps working if that row has since
+    been deleted. ``before_id`` alone also works while the row still exists.
+    ``skip`` is kept for existing clients.
+    """
+    query = db.query(models.Calculation).order_by(
+        models.Calculation.created_at.desc(), models.Calculation.id.desc()
     )
-    return calculations
+    if before_id is not None:
+        cursor = before_created_at
+        if cursor is None:
+            cursor = (
+                db.query(models.Calculation.created_at)
+                .filter(models.Calculation.id == before_id)
+                .scalar()
+            )
+            if cursor is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        "Cursor calculation no longer exists; "
+                        "pass before_created_at along with before_id."
+                    ),
+                )
+        # Row-value comparison lets SQLite seek on ix_calc_created_id
+        query = query.filter(
+            tuple_(models.Calculation.created_at, models.Calculation.id)
+            < tuple_(cursor, before_id)
+        )
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
 
 
 @router.get("/history/count")
-def get_history_count(db: Session = Depends(get_db)):
-    count = db.query(models.Calculation).count()
-    return {"total": count}
+def get_history_count(exact: bool = False, db: Session = Depends(get_db)):
+    """
+    Number of stored calculations.
+
+    Read from the trigger-maintained counters row; ``exact=true`` runs a
+    COUNT over the table instead.
+    """
+    total = None
+    if not exact:
+        total = db.scalar(
+            select(models.Counter.value).where(models.Counter.name == "calculations")
+        )
+    if total is None:
+        total = db.query(func.count(models.Calculation.id)).scalar()
+    return {"total": total}
 
 
 @router.delete("/history", status_code=status.HTTP_204_NO_CONTENT)
@@ -95,9 +139,13 @@ def delete_calculations(
     if not payload.ids:
         return
 
-    db.query(models.Calculation).filter(models.Calculation.id.in_(payload.ids)).delete(
-        synchronize_session=False
-    )
+    # Each id is a bound parameter; chunk to stay under SQLite's variable limit
+    # (999 before 3.32) on large deletes
+    for start in range(0, len(payload.ids), DELETE_CHUNK_SIZE):
+        chunk = payload.ids[start:start + DELETE_CHUNK_SIZE]
+        db.query(models.Calculation).filter(
+            models.Calculation.id.in_(chunk)
+        ).delete(synchronize_session=False)
     db.commit()
 
 
@@ -119,30 +167,7 @@ def get_calculation(
             detail="Calculation not found.",
         )
 
-    # Recompute d1 and d2 for completeness; prices are persisted
-    call_price, put_price, d1, d2 = calculate_call_put(
-        s0=calc.s0,
-        x=calc.x,
-        t=calc.t,
-        r=calc.r,
-        d=calc.d,
-        v=calc.v,
-    )
-    # Use stored prices (for consistency with DB), but expose d1/d2 from recomputation
-    return schemas.CalculationRead(
-        id=calc.id,
-        s0=calc.s0,
-        x=calc.x,
-        t=calc.t,
-        r=calc.r,
-        d=calc.d,
-        v=calc.v,
-        call_price=calc.call_price,
-        put_price=calc.put_price,
-        d1=d1,
-        d2=d2,
-        created_at=calc.created_at,
-    )
+    return calc
 
 
 @router.post(
@@ -157,54 +182,66 @@ def batch_calculate(
     Calculate Black-Scholes prices for multiple parameter sets at once.
     Returns all successful calculations and counts of successful/failed attempts.
     """
+    inputs = payload.calculations
+    s0 = np.array([c.s0 for c in inputs], dtype=float)
+    x = np.array([c.x for c in inputs], dtype=float)
+    t = np.array([c.t for c in inputs], dtype=float)
+    r = np.array([c.r for c in inputs], dtype=float)
+    d = np.array([c.d for c in inputs], dtype=float)
+    v = np.array([c.v for c in inputs], dtype=float)
+
+    # Price every row in one vectorised pass; invalid rows are masked out below
+    with np.errstate(all="ignore"):
+        call_prices, put_prices, d1s, d2s = calculate_call_put_batch(
+            s0, x, t, r, d, v
+        )
+    valid = (
+        (s0 > 0)
+        & (x > 0)
+        & (t > 0)
+        & (v > 0)
+        & np.isfinite(call_prices)
+        & np.isfinite(put_prices)
+    )
+
+    rows = [
+        {
+            "s0": inputs[i].s0,
+            "x": inputs[i].x,
+            "t": inputs[i].t,
+            "r": inputs[i].r,
+            "d": inputs[i].d,
+            "v": inputs[i].v,
+            "call_price": float(call_prices[i]),
+            "put_price": float(put_prices[i]),
+            "d1": float(d1s[i]),
+            "d2": float(d2s[i]),
+        }
+        for i in np.flatnonzero(valid)
+    ]
+
     results: List[schemas.CalculationRead] = []
-    successful = 0
-    failed = 0
-
-    for calc_input in payload.calculations:
-        try:
-            call_price, put_price, d1, d2 = calculate_call_put(
-                s0=calc_input.s0,
-                x=calc_input.x,
-                t=calc_input.t,
-                r=calc_input.r,
-                d=calc_input.d,
-                v=calc_input.v,
+    if rows:
+        # One multi-row INSERT; RETURNING hands back the generated ids/timestamps.
+        # RETURNING order is unspecified, but SQLite assigns rowids in VALUES
+        # order within a statement, so sorting by id lines them up with rows.
+        # (sort_by_parameter_order=True would fall back to one INSERT per row,
+        # as this table has no sentinel column.)
+        inserted = sorted(
+            db.execute(
+                insert(models.Calculation).returning(
+                    models.Calculation.id, models.Calculation.created_at
+                ),
+                rows,
+            ).all()
+        )
+        for row, (calc_id, created_at) in zip(rows, inserted):
+            results.append(
+                schemas.CalculationRead(id=calc_id, created_at=created_at, **row)
             )
 
-            calc = models.Calculation(
-                s0=calc_input.s0,
-                x=calc_input.x,
-                t=calc_input.t,
-                r=calc_input.r,
-                d=calc_input.d,
-                v=calc_input.v,
-                call_price=call_price,
-                put_price=put_price,
-            )
-            db.add(calc)
-            db.flush()  # Get ID without committing
-
-            result = schemas.CalculationRead(
-                id=calc.id,
-                s0=calc.s0,
-                x=calc.x,
-                t=calc.t,
-                r=calc.r,
-                d=calc.d,
-                v=calc.v,
-                call_price=calc.call_price,
-                put_price=calc.put_price,
-                d1=d1,
-                d2=d2,
-                created_at=calc.created_at,
-            )
-            results.append(result)
-            successful += 1
-        except (ValueError, Exception) as exc:
-            failed += 1
-            # Continue processing other calculations even if one fails
-            continue
+    successful = len(results)
+    failed = len(inputs) - successful
 
     # Commit all successful calculations at once
     db.commit()
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CalculationBase(BaseModel):
@@ -18,35 +18,20 @@ class CalculationCreate(CalculationBase):
 
 
 class CalculationRead(CalculationBase):
-    id: int
-    call_price: float
-    put_price: float
-    d1: float
-    d2: float
-    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
 
-    class Config:
-        from_attributes = True
-
-
-class CalculationSummary(BaseModel):
     id: int
-    s0: float
-    x: float
-    t: float
-    r: float
-    d: float
-    v: float
     call_price: float
     put_price: float
+    # Nullable in the database (legacy rows are backfilled on startup); the
+    # history list excludes them from the output
+    d1: Optional[float] = None
+    d2: Optional[float] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class BatchCalculationRequest(BaseModel):
-    calculations: List[CalculationCreate] = Field(..., min_items=1, max_items=100)
+    calculations: List[CalculationCreate] = Field(..., min_length=1, max_length=100)
 
 
 class BatchCalculationResponse(BaseModel):
@@ -57,5 +42,5 @@ class BatchCalculationResponse(BaseModel):
 
 
 class HistoryDeleteRequest(BaseModel):
-    ids: List[int] = Field(..., min_items=1, description="IDs of calculations to delete")
+    ids: List[int] = Field(..., min_length=1, description="IDs of calculations to delete")
 
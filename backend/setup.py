@@ -0,0 +1,30 @@
+"""
+Build the optional compiled pricing kernel.
+
+Usage:
+    cd backend
+    python -m pip install cython
+    python setup.py build_ext --inplace
+"""
+import sys
+
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+if sys.platform == "win32":
+    extra_compile_args = ["/O2", "/fp:fast"]
+else:
+    extra_compile_args = ["-O3", "-ffast-math", "-march=native"]
+
+setup(
+    name="black-scholes-ext",
+    ext_modules=cythonize(
+        [
+            Extension(
+                "app._bs_ext",
+                ["app/_bs_ext.pyx"],
+                extra_compile_args=extra_compile_args,
+            )
+        ]
+    ),
+)
@@ -1,5 +1,8 @@
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app.main import app
@@ -131,6 +134,7 @@ class TestHistoryEndpoint:
         assert all("call_price" in item for item in data)
         assert all("put_price" in item for item in data)
         assert all("created_at" in item for item in data)
+        assert all("d1" not in item and "d2" not in item for item in data)
 
     def test_history_ordered_by_date(self, client: TestClient):
         """Test that history is ordered by creation date (newest first)."""
@@ -152,6 +156,128 @@ class TestHistoryEndpoint:
         assert len(data) >= 2
         assert data[0]["created_at"] >= data[1]["created_at"]
 
+    def test_history_keyset_pagination(self, client: TestClient):
+        """Test paging with before_id returns the next rows without overlap."""
+        payload = {
+            "s0": 100.0, "x": 100.0, "t": 1.0,
+            "r": 0.05, "d": 0.02, "v": 0.2,
+        }
+        for _ in range(5):
+            client.post("/api/calculate", json=payload)
+
+        first_page = client.get("/api/history", params={"limit": 3}).json()
+        second_page = client.get(
+            "/api/history", params={"limit": 3, "before_id": first_page[-1]["id"]}
+        ).json()
+
+        assert len(first_page) == 3
+        assert len(second_page) == 2
+        all_ids = [item["id"] for item in first_page + second_page]
+        assert len(set(all_ids)) == 5
+        assert all_ids == [item["id"] for item in client.get(
+            "/api/history", params={"limit": 5}
+        ).json()]
+
+    def test_history_before_deleted_cursor(
+        self, client: TestClient, db_session: Session
+    ):
+        """Test paging past a deleted cursor when created_at is not in id order."""
+        # Backdated timestamps, as written by add_sample_data.py
+        days = [3, 9, 1, 7, 5, 2, 8]
+        db_session.add_all([
+            models.Calculation(
+                s0=100.0, x=100.0, t=1.0, r=0.05, d=0.0, v=0.2,
+                call_price=10.0, put_price=5.0,
+                created_at=datetime(2026, 1, 10) - timedelta(days=n),
+            )
+            for n in days
+        ])
+        db_session.commit()
+        expected = [
+            item["id"] for item in client.get("/api/history", params={"limit": 7}).json()
+        ]
+
+        first_page = client.get("/api/history", params={"limit": 3}).json()
+        last_shown = first_page[-1]
+        client.request("DELETE", "/api/history", json={"ids": [last_shown["id"]]})
+
+        response = client.get(
+            "/api/history",
+            params={
+                "limit": 3,
+                "before_id": last_shown["id"],
+                "before_created_at": last_shown["created_at"],
+            },
+        )
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == expected[3:6]
+
+    def test_history_deleted_cursor_without_created_at(self, client: TestClient):
+        """Test that a deleted cursor without before_created_at is rejected."""
+        response = client.get("/api/history", params={"before_id": 99999})
+
+        assert response.status_code == 400
+        assert "before_created_at" in response.json()["detail"]
+
+
+class TestHistoryCountEndpoint:
+    """Test the GET /api/history/count endpoint."""
+
+    def test_count_tracks_inserts_and_deletes(self, client: TestClient):
+        """Test that the count follows writes made through the API."""
+        payload = {
+            "s0": 100.0, "x": 100.0, "t": 1.0,
+            "r": 0.05, "d": 0.02, "v": 0.2,
+        }
+        assert client.get("/api/history/count").json() == {"total": 0}
+
+        ids = [client.post("/api/calculate", json=payload).json()["id"] for _ in range(3)]
+        assert client.get("/api/history/count").json() == {"total": 3}
+
+        client.request("DELETE", "/api/history", json={"ids": ids[:2]})
+        assert client.get("/api/history/count").json() == {"total": 1}
+
+    def test_count_includes_writes_outside_api(
+        self, client: TestClient, db_session: Session
+    ):
+        """Test that rows written directly to the table are counted immediately."""
+        assert client.get("/api/history/count").json() == {"total": 0}
+        db_session.add(models.Calculation(
+            s0=100.0, x=100.0, t=1.0, r=0.05, d=0.0, v=0.2,
+            call_price=10.0, put_price=5.0,
+        ))
+        db_session.commit()
+
+        assert client.get("/api/history/count").json() == {"total": 1}
+        assert client.get("/api/history/count", params={"exact": True}).json() == {"total": 1}
+
+
+class TestDeleteHistoryEndpoint:
+    """Test the DELETE /api/history endpoint."""
+
+    def test_delete_more_ids_than_one_chunk(
+        self, client: TestClient, db_session: Session
+    ):
+        """Test deleting an id list larger than the per-statement chunk."""
+        db_session.add_all([
+            models.Calculation(
+                s0=100.0, x=100.0, t=1.0, r=0.05, d=0.0, v=0.2,
+                call_price=10.0, put_price=5.0,
+            )
+            for _ in range(3)
+        ])
+        db_session.commit()
+        ids = [calc.id for calc in db_session.query(models.Calculation).all()]
+
+        response = client.request(
+            "DELETE", "/api/history", json={"ids": ids[:2] + list(range(10_000, 11_200))}
+        )
+
+        assert response.status_code == 204
+        remaining = db_session.query(models.Calculation).all()
+        assert [calc.id for calc in remaining] == ids[2:]
+
 
 class TestGetCalculationById:
     """Test the GET /api/history/{id} endpoint."""
@@ -180,3 +306,57 @@ class TestGetCalculationById:
         
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
+
+
+class TestBatchCalculateEndpoint:
+    """Test the POST /api/calculate/batch endpoint."""
+
+    def test_batch_success(self, client: TestClient):
+        """Test pricing several parameter sets in one request."""
+        payload = {
+            "calculations": [
+                {"s0": 100.0, "x": 100.0, "t": 1.0, "r": 0.05, "d": 0.02, "v": 0.2},
+                {"s0": 120.0, "x": 100.0, "t": 0.5, "r": 0.03, "d": 0.0, "v": 0.3},
+            ]
+        }
+        response = client.post("/api/calculate/batch", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["successful"] == 2
+        assert data["failed"] == 0
+        assert len({item["id"] for item in data["results"]}) == 2
+        assert data["results"][1]["s0"] == 120.0
+
+        single = client.post("/api/calculate", json=payload["calculations"][0]).json()
+        assert abs(data["results"][0]["call_price"] - single["call_price"]) < 1e-10
+        assert abs(data["results"][0]["d1"] - single["d1"]) < 1e-10
+
+    def test_batch_uses_single_insert(self, client: TestClient, db_session: Session):
+        """Test that a batch is written with one INSERT and ids match inputs."""
+        calculations = [
+            {"s0": 50.0 + i, "x": 100.0, "t": 1.0, "r": 0.05, "d": 0.02, "v": 0.2}
+            for i in range(100)
+        ]
+        inserts = []
+
+        def count_inserts(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("INSERT"):
+                inserts.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count_inserts)
+        try:
+            response = client.post(
+                "/api/calculate/batch", json={"calculations": calculations}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count_inserts)
+
+        assert response.status_code == 200
+        assert len(inserts) == 1
+        for item in response.json()["results"]:
+            stored = db_session.get(models.Calculation, item["id"])
+            assert stored.s0 == item["s0"]
+            assert stored.call_price == item["call_price"]
@@ -1,6 +1,13 @@
 import math
+import numpy as np
 import pytest
-from app.black_scholes import calculate_d1_d2, calculate_call_put
+from app.black_scholes import (
+    _calculate_call_put_cached,
+    calculate_call_put,
+    calculate_call_put_batch,
+    calculate_d1_d2,
+)
+from app.black_scholes_numba import bs_kernel
 
 
 class TestCalculateD1D2:
@@ -108,6 +115,28 @@ class TestCalculateCallPut:
         # Should be approximately equal (within numerical precision)
         assert abs(left_side - right_side) < 1e-6
 
+    def test_put_matches_closed_form(self):
+        """Test the parity-derived put against the direct N(-d1)/N(-d2) formula."""
+        from scipy.special import ndtr
+
+        s0, x, t, r, d, v = 95.0, 105.0, 0.75, 0.04, 0.015, 0.3
+        call_price, put_price, d1, d2 = calculate_call_put(s0, x, t, r, d, v)
+
+        expected_put = (
+            x * math.exp(-r * t) * ndtr(-d2) - s0 * math.exp(-d * t) * ndtr(-d1)
+        )
+        assert abs(put_price - expected_put) < 1e-10
+
+    def test_deep_out_of_the_money_put_not_negative(self):
+        """Test that the parity-derived put never comes out below zero."""
+        # Parity cancels to about -1e-14 here without the clamp
+        call_price, put_price, d1, d2 = calculate_call_put(
+            166.54, 28.76, 1.73, 0.093, 0.021, 0.116
+        )
+
+        assert put_price >= 0
+        assert put_price < 1e-12
+
     def test_zero_dividend(self):
         """Test calculation with zero dividend yield."""
         s0, x, t, r, d, v = 100.0, 100.0, 0.5, 0.05, 0.0, 0.25
@@ -138,3 +167,82 @@ class TestCalculateCallPut:
         """Test that validation errors from d1/d2 propagate."""
         with pytest.raises(ValueError):
             calculate_call_put(-100.0, 100.0, 1.0, 0.05, 0.0, 0.2)
+
+    def test_repeated_inputs_hit_cache(self):
+        """Test that identical parameters are served from the cache."""
+        params = (101.5, 99.25, 0.75, 0.04, 0.01, 0.3)
+        first = calculate_call_put(*params)
+        hits = _calculate_call_put_cached.cache_info().hits
+
+        assert calculate_call_put(*params) == first
+        assert _calculate_call_put_cached.cache_info().hits == hits + 1
+
+
+class TestBsKernel:
+    """Test the erfc-based kernel used for the numba path."""
+
+    @pytest.mark.parametrize(
+        "s0, x, t, r, d, v",
+        [
+            (100.0, 100.0, 1.0, 0.05, 0.02, 0.2),
+            (150.0, 80.0, 0.25, 0.01, 0.0, 0.45),
+            (60.0, 190.0, 4.5, 0.09, 0.04, 0.15),
+        ],
+    )
+    def test_matches_scipy_path(self, s0, x, t, r, d, v):
+        """Test that the kernel agrees with the scipy implementation."""
+        expected = calculate_call_put(s0, x, t, r, d, v)
+        actual = bs_kernel(s0, x, t, r, d, v)
+
+        for a, e in zip(actual, expected):
+            assert abs(a - e) < 1e-9
+
+    def test_compiled_extension_matches_kernel(self):
+        """Test the Cython extension, when built, against the Python kernel."""
+        ext = pytest.importorskip("app._bs_ext")
+        params = (120.0, 100.0, 2.0, 0.03, 0.01, 0.35)
+
+        for a, e in zip(ext.bs_price(*params), bs_kernel(*params)):
+            assert abs(a - e) < 1e-9
+
+
+class TestCalculateCallPutBatch:
+    """Test the vectorised batch pricing function."""
+
+    def test_matches_scalar(self):
+        """Test that each batch element matches the scalar calculation."""
+        params = [
+            (100.0, 100.0, 1.0, 0.05, 0.02, 0.2),
+            (110.0, 100.0, 0.5, 0.03, 0.01, 0.25),
+            (90.0, 120.0, 2.0, 0.07, 0.0, 0.4),
+        ]
+        columns = [np.array(col) for col in zip(*params)]
+        calls, puts, d1s, d2s = calculate_call_put_batch(*columns)
+
+        for i, p in enumerate(params):
+            call_price, put_price, d1, d2 = calculate_call_put(*p)
+            assert abs(calls[i] - call_price) < 1e-10
+            assert abs(puts[i] - put_price) < 1e-10
+            assert abs(d1s[i] - d1) < 1e-10
+            assert abs(d2s[i] - d2) < 1e-10
+
+    def test_no_negative_prices_in_the_tails(self):
+        """Test that far-tail inputs never produce negative prices."""
+        rng = np.random.default_rng(0)
+        n = 20_000
+        columns = [
+            rng.uniform(50, 200, n),
+            rng.uniform(1, 200, n),
+            rng.uniform(0.01, 5.0, n),
+            rng.uniform(0.01, 0.10, n),
+            rng.uniform(0.0, 0.05, n),
+            rng.uniform(0.05, 0.5, n),
+        ]
+        calls, puts, _, _ = calculate_call_put_batch(*columns)
+
+        assert (calls >= 0).all()
+        assert (puts >= 0).all()
+        for params in zip(*(col[:2_000] for col in columns)):
+            call_price, put_price, _, _ = bs_kernel(*map(float, params))
+            assert call_price >= 0
+            assert put_price >= 0
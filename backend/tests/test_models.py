@@ -1,7 +1,9 @@
 import pytest
 from datetime import datetime
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session
 
+from app.database import upgrade_calculations_table
 from app.models import Calculation
 
 
@@ -99,3 +101,34 @@ class TestCalculationModel:
         
         # Second calculation should have a later timestamp
         assert time2 >= time1
+
+    def test_upgrade_backfills_d1_d2_once(self, tmp_path):
+        """Test that adding the d1/d2 columns backfills existing rows once."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as conn:
+            # calculations table as created before d1/d2 were persisted
+            conn.execute(text(
+                "CREATE TABLE calculations (id INTEGER NOT NULL PRIMARY KEY, "
+                "s0 FLOAT NOT NULL, x FLOAT NOT NULL, t FLOAT NOT NULL, "
+                "r FLOAT NOT NULL, d FLOAT NOT NULL, v FLOAT NOT NULL, "
+                "call_price FLOAT NOT NULL, put_price FLOAT NOT NULL, "
+                "created_at DATETIME NOT NULL)"
+            ))
+            conn.execute(text(
+                "INSERT INTO calculations VALUES "
+                "(1, 100, 100, 1, 0.05, 0.02, 0.2, 9.23, 6.33, '2025-01-01 10:00:00.000000')"
+            ))
+
+        upgrade_calculations_table(engine)
+        with engine.connect() as conn:
+            d1, d2 = conn.execute(text("SELECT d1, d2 FROM calculations")).one()
+        assert abs(d1 - 0.25) < 1e-10
+        assert abs(d2 - 0.05) < 1e-10
+
+        # Later startups do not rescan for NULLs
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE calculations SET d1 = NULL"))
+        upgrade_calculations_table(engine)
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT d1 FROM calculations")).scalar() is None
+        engine.dispose()